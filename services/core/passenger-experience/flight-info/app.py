@@ -51,8 +51,7 @@ async def flight_data_updater():
 async def update_single_flight(flight_number: str):
     """Update a single flight's data."""
     try:
-        flight_service = FlightService()
-        flight_data = await flight_service.get_flight_info(
+        flight_data = await app_state.flight_service.get_flight_info(
             flight_number,
             include_position=True,
             include_weather=True,
@@ -61,14 +60,14 @@ async def update_single_flight(flight_number: str):
         
         if flight_data:
             # Broadcast update to WebSocket clients
-            await broadcast_flight_update(flight_number, flight_data.dict())
+            await broadcast_flight_update(flight_number, flight_data.model_dump(mode="json"))
             
             # Store in cache with freshness timestamp
             cache_key = f"flight:{flight_number}:latest"
             await app_state.redis.setex(
                 cache_key, 
                 CONFIG["CACHE_TTL_SECONDS"], 
-                json.dumps(flight_data.dict(), default=str)
+                flight_data.model_dump_json()
             )
             
         METRICS["data_freshness"].labels(data_type="flight").observe(0)
@@ -320,15 +319,19 @@ async def lifespan(app: FastAPI):
             max_connections=50
         )
         await app_state.redis.ping()
+        app_state.redis_bin = create_binary_redis(CONFIG["REDIS_URL"])
+        await app_state.redis_bin.ping()
         logger.info("✅ Redis connection established")
         
         # Initialize PostgreSQL connection pool
         logger.info("🔄 Connecting to PostgreSQL...")
         app_state.db_pool = await asyncpg.create_pool(
             CONFIG["DATABASE_URL"],
-            min_size=5,
-            max_size=20,
+            min_size=10,
+            max_size=50,
+            max_inactive_connection_lifetime=300,
             command_timeout=30,
+            statement_cache_size=1024,
             server_settings={
                 'jit': 'off',
                 'application_name': 'flight-info'
@@ -353,7 +356,8 @@ async def lifespan(app: FastAPI):
         timeout = httpx.Timeout(30.0, connect=10.0)
         app_state.http_client = httpx.AsyncClient(
             timeout=timeout,
-            limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+            limits=httpx.Limits(max_connections=50, max_keepalive_connections=20, keepalive_expiry=30),
+            http2=True,
             headers={
                 "User-Agent": f"AeroFusionXR-Flight-Info/{CONFIG['VERSION']}",
                 "Accept": "application/json"
@@ -363,8 +367,9 @@ async def lifespan(app: FastAPI):
         
         # Initialize flight service
         logger.info("🔄 Initializing Flight Service...")
-        flight_service = FlightService()
-        await flight_service.initialize()
+        # Shared so the model is loaded and warmed once per process
+        app_state.flight_service = FlightService()
+        await app_state.flight_service.initialize()
         logger.info("✅ Flight Service initialized")
         
         # Start background tasks
@@ -402,6 +407,10 @@ async def lifespan(app: FastAPI):
         await asyncio.gather(*app_state.background_tasks, return_exceptions=True)
         logger.info("✅ Background tasks stopped")
         
+        # Write out flight rows still waiting for a batch
+        if app_state.flight_service:
+            await app_state.flight_service.close()
+        
         # Close connections
         if app_state.http_client:
             await app_state.http_client.aclose()
@@ -411,6 +420,9 @@ async def lifespan(app: FastAPI):
             await app_state.db_pool.close()
             logger.info("✅ Database pool closed")
         
+        if app_state.redis_bin:
+            await app_state.redis_bin.close()
+        
         if app_state.redis:
             await app_state.redis.close()
             logger.info("✅ Redis connection closed")
@@ -507,6 +519,7 @@ app = FastAPI(
     redoc_url="/redoc",
     openapi_url="/openapi.json",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
     swagger_ui_parameters={
         "deepLinking": True,
         "displayRequestDuration": True,
@@ -611,12 +624,61 @@ async def verify_token(credentials: HTTPAuthorizationCredentials = Depends(secur
 # CORE API ENDPOINTS
 # ================================
 
+_HEALTH_CACHE_SECONDS = 1.0
+_health_cache: List[Any] = [0.0, None]
+
+async def _check_redis() -> Tuple[str, Dict[str, Any], bool]:
+    """Ping Redis and report its component health."""
+    try:
+        redis_start = time.time()
+        await app_state.redis.ping()
+        redis_latency = time.time() - redis_start
+        return "redis", {
+            "status": "healthy",
+            "latency_ms": round(redis_latency * 1000, 2)
+        }, True
+    except Exception as e:
+        return "redis", {
+            "status": "unhealthy",
+            "error": str(e)
+        }, False
+
+async def _check_db() -> Tuple[str, Dict[str, Any], bool]:
+    """Ping PostgreSQL and report its component health."""
+    try:
+        if not app_state.db_pool:
+            return "database", {
+                "status": "unhealthy",
+                "error": "Database pool not initialized"
+            }, False
+        
+        db_start = time.time()
+        async with app_state.db_pool.acquire() as conn:
+            await conn.execute("SELECT 1")
+        db_latency = time.time() - db_start
+        return "database", {
+            "status": "healthy",
+            "latency_ms": round(db_latency * 1000, 2),
+            "pool_size": app_state.db_pool.get_size()
+        }, True
+    except Exception as e:
+        return "database", {
+            "status": "unhealthy",
+            "error": str(e)
+        }, False
+
 @app.get("/health",
          summary="Service Health Check",
          description="Comprehensive health check for Flight Information service",
          tags=["System"])
 async def health_check():
     """Comprehensive health check endpoint."""
+    # Bursty liveness/readiness probes share the result of the last second
+    now = time.monotonic()
+    if _health_cache[1] is not None and now - _health_cache[0] < _HEALTH_CACHE_SECONDS:
+        content, status_code = _health_cache[1]
+        return JSONResponse(content=content, status_code=status_code)
+    
     health_status = {
         "status": "healthy",
         "timestamp": datetime.utcnow().isoformat(),
@@ -629,46 +691,21 @@ async def health_check():
     
     overall_healthy = True
     
-    # Check Redis
-    try:
-        redis_start = time.time()
-        await app_state.redis.ping()
-        redis_latency = time.time() - redis_start
-        health_status["components"]["redis"] = {
-            "status": "healthy",
-            "latency_ms": round(redis_latency * 1000, 2)
-        }
-    except Exception as e:
-        health_status["components"]["redis"] = {
-            "status": "unhealthy",
-            "error": str(e)
-        }
-        overall_healthy = False
-    
-    # Check database
-    try:
-        if app_state.db_pool:
-            db_start = time.time()
-            async with app_state.db_pool.acquire() as conn:
-                await conn.execute("SELECT 1")
-            db_latency = time.time() - db_start
-            health_status["components"]["database"] = {
-                "status": "healthy",
-                "latency_ms": round(db_latency * 1000, 2),
-                "pool_size": app_state.db_pool.get_size()
-            }
-        else:
-            health_status["components"]["database"] = {
+    # Check Redis and database concurrently
+    results = await asyncio.gather(_check_redis(), _check_db(), return_exceptions=True)
+    for component, result in zip(("redis", "database"), results):
+        if isinstance(result, BaseException):
+            health_status["components"][component] = {
                 "status": "unhealthy",
-                "error": "Database pool not initialized"
+                "error": str(result)
             }
             overall_healthy = False
-    except Exception as e:
-        health_status["components"]["database"] = {
-            "status": "unhealthy",
-            "error": str(e)
-        }
-        overall_healthy = False
+            continue
+        
+        name, component_status, healthy = result
+        health_status["components"][name] = component_status
+        if not healthy:
+            overall_healthy = False
     
     # Check vendor status
     healthy_vendors = 0
@@ -704,8 +741,21 @@ async def health_check():
         health_status["status"] = "degraded" if healthy_vendors > 0 else "unhealthy"
     
     status_code = 200 if overall_healthy else 503
+    _health_cache[0] = now
+    _health_cache[1] = (health_status, status_code)
     return JSONResponse(content=health_status, status_code=status_code)
 
+_METRICS_CACHE_SECONDS = 0.5
+_metrics_cache: List[Any] = [0.0, b""]
+
+def _cached_metrics() -> bytes:
+    """Serialize the registry at most once per cache window."""
+    now = time.monotonic()
+    if now - _metrics_cache[0] > _METRICS_CACHE_SECONDS:
+        _metrics_cache[0] = now
+        _metrics_cache[1] = generate_latest()
+    return _metrics_cache[1]
+
 @app.get("/metrics",
          summary="Prometheus Metrics",
          description="Prometheus-formatted metrics for monitoring",
@@ -714,7 +764,7 @@ async def health_check():
 async def get_metrics():
     """Prometheus metrics endpoint."""
     return Response(
-        content=generate_latest(),
+        content=_cached_metrics(),
         media_type="text/plain; version=0.0.4; charset=utf-8"
     )
 
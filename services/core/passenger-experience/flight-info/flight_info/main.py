@@ -1,19 +1,21 @@
 import asyncio
+import time
+from contextlib import asynccontextmanager
 from datetime import datetime, timedelta
-from typing import List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional
 
-from fastapi import FastAPI, HTTPException, Query, Depends, BackgroundTasks
+from fastapi import FastAPI, HTTPException, Query, Depends, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
 from motor.motor_asyncio import AsyncIOMotorClient
-from redis.asyncio import Redis
+from redis.asyncio import ConnectionPool, Redis
 from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
 from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
 
 from .models.flight import Flight, FlightStatus
 from .models.subscription import WebhookSubscription, SubscriptionEvent
-from .services.flight_tracker import FlightTracker
-from .services.webhook_dispatcher import WebhookDispatcher
+from .services.flight_tracker import FLIGHT_PROJECTION, FlightTracker, make_vendor_client
+from .services.webhook_dispatcher import WebhookDispatcher, make_webhook_session
 from .utils.logger import setup_logging, get_request_logger
 from .utils.metrics import api_metrics
 
@@ -22,11 +24,135 @@ from .utils.metrics import api_metrics
 setup_logging("flight-info")
 logger = get_request_logger()
 
+VENDOR_CONFIGS = [
+    {
+        "name": "vendor1",
+        "url": "https://api.vendor1.com/flights/{flight_number}",
+        "headers": {"Authorization": "Bearer token1"},
+    },
+    {
+        "name": "vendor2",
+        "url": "https://api.vendor2.com/v1/flight-status/{flight_number}",
+        "headers": {"X-API-Key": "token2"},
+    },
+]
+
+RETRY_QUEUE_SIZE = 1000
+
+# (query param, Mongo field, value transform) for equality filters in search_flights
+_FILTERS = (
+    ("origin", "origin.code", str.upper),
+    ("destination", "destination.code", str.upper),
+    ("airline", "airline", None),
+    ("status", "status", None),
+)
+
+ROUTE_INDEX = "origin_destination_departure"
+AIRLINE_INDEX = "airline_departure"
+
+
+async def _ensure_indexes(mongo: AsyncIOMotorClient) -> None:
+    """Create the indices backing flight lookups and searches."""
+    flights = mongo.flights.current
+    await flights.create_index(
+        [("origin.code", 1), ("destination.code", 1), ("scheduled_departure", 1)],
+        name=ROUTE_INDEX,
+    )
+    await flights.create_index([("flight_number", 1)], unique=True)
+    await flights.create_index(
+        [("airline", 1), ("scheduled_departure", 1)],
+        name=AIRLINE_INDEX,
+    )
+    await mongo.flights.historical.create_index(
+        [("flight_number", 1), ("scheduled_departure", 1)]
+    )
+
+
+def _pick_hint(query: Dict[str, Any]) -> Optional[str]:
+    """Pin the search to the index matching its leading filter."""
+    if "origin.code" in query:
+        return ROUTE_INDEX
+    if "airline" in query:
+        return AIRLINE_INDEX
+    return None
+
+
+async def _retry_worker(dispatcher: WebhookDispatcher, queue: asyncio.Queue) -> None:
+    """Drain retry requests one at a time, independent of the HTTP request lifecycle."""
+    while True:
+        await queue.get()
+        try:
+            await dispatcher.retry_failed_deliveries()
+        except Exception as e:
+            logger.error("Webhook retry failed", error=str(e))
+        finally:
+            queue.task_done()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Create shared clients once and release them on shutdown."""
+    logger.info("Starting Flight Info service")
+    app.state.mongo = AsyncIOMotorClient(
+        "mongodb://localhost:27017",
+        maxPoolSize=100,
+        minPoolSize=10,
+        waitQueueTimeoutMS=2000,
+        serverSelectionTimeoutMS=3000,
+        appname="flight-info",
+    )
+    app.state.redis = Redis(
+        connection_pool=ConnectionPool.from_url(
+            "redis://localhost:6379",
+            max_connections=64,
+            socket_timeout=2,
+            socket_connect_timeout=1,
+            health_check_interval=30,
+        )
+    )
+    # Warm both pools so the first request does not pay connection setup
+    await app.state.mongo.admin.command("ping")
+    await app.state.redis.ping()
+    app.state.http = make_webhook_session()
+    app.state.vendor_http = make_vendor_client()
+    app.state.tracker = FlightTracker(
+        mongo_client=app.state.mongo,
+        redis_client=app.state.redis,
+        vendor_configs=VENDOR_CONFIGS,
+    )
+    app.state.dispatcher = WebhookDispatcher(
+        mongo_client=app.state.mongo, redis_client=app.state.redis
+    )
+    await _ensure_indexes(app.state.mongo)
+    await app.state.dispatcher.ensure_indexes()
+    await app.state.tracker.start(app.state.vendor_http)
+    await app.state.dispatcher.start(app.state.http)
+    app.state.retry_queue = asyncio.Queue(maxsize=RETRY_QUEUE_SIZE)
+    retry_task = asyncio.create_task(
+        _retry_worker(app.state.dispatcher, app.state.retry_queue)
+    )
+    try:
+        yield
+    finally:
+        logger.info("Shutting down Flight Info service")
+        retry_task.cancel()
+        await asyncio.gather(retry_task, return_exceptions=True)
+        await app.state.dispatcher.stop()
+        await app.state.tracker.stop()
+        await app.state.vendor_http.aclose()
+        await app.state.http.close()
+        await app.state.redis.close()
+        await app.state.redis.connection_pool.disconnect()
+        app.state.mongo.close()
+
+
 # Create FastAPI app
 app = FastAPI(
     title="Flight Info Service",
     description="Real-time flight status and schedule service for AeroFusion XR",
     version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # Add CORS middleware
@@ -43,67 +169,41 @@ FastAPIInstrumentor.instrument_app(app)
 
 
 # Dependencies
-async def get_mongo():
-    client = AsyncIOMotorClient("mongodb://localhost:27017")
-    try:
-        yield client
-    finally:
-        client.close()
+async def get_mongo(request: Request) -> AsyncIOMotorClient:
+    return request.app.state.mongo
 
 
-async def get_redis():
-    redis = Redis(host="localhost", port=6379, decode_responses=True)
-    try:
-        yield redis
-    finally:
-        await redis.close()
+async def get_redis(request: Request) -> Redis:
+    return request.app.state.redis
 
 
-async def get_flight_tracker(
-    mongo: AsyncIOMotorClient = Depends(get_mongo),
-    redis: Redis = Depends(get_redis),
-):
-    tracker = FlightTracker(
-        mongo_client=mongo,
-        redis_client=redis,
-        vendor_configs=[
-            {
-                "name": "vendor1",
-                "url": "https://api.vendor1.com/flights/{flight_number}",
-                "headers": {"Authorization": "Bearer token1"},
-            },
-            {
-                "name": "vendor2",
-                "url": "https://api.vendor2.com/v1/flight-status/{flight_number}",
-                "headers": {"X-API-Key": "token2"},
-            },
-        ],
-    )
-    await tracker.start()
-    try:
-        yield tracker
-    finally:
-        await tracker.stop()
+async def get_flight_tracker(request: Request) -> FlightTracker:
+    return request.app.state.tracker
 
 
-async def get_webhook_dispatcher(
-    mongo: AsyncIOMotorClient = Depends(get_mongo),
-    redis: Redis = Depends(get_redis),
-):
-    dispatcher = WebhookDispatcher(mongo_client=mongo, redis_client=redis)
-    await dispatcher.start()
-    try:
-        yield dispatcher
-    finally:
-        await dispatcher.stop()
+async def get_webhook_dispatcher(request: Request) -> WebhookDispatcher:
+    return request.app.state.dispatcher
+
+
+async def _stream_json_array(flights: AsyncIterator[Flight]) -> AsyncIterator[bytes]:
+    """Encode flights as a JSON array one document at a time."""
+    yield b"["
+    first = True
+    async for flight in flights:
+        if not first:
+            yield b","
+        first = False
+        # Serialize straight to JSON instead of building a dict and encoding it again
+        yield flight.model_dump_json().encode()
+    yield b"]"
 
 
 # Middleware for metrics
 @app.middleware("http")
 async def metrics_middleware(request, call_next):
-    start_time = datetime.utcnow()
+    start_time = time.perf_counter()
     response = await call_next(request)
-    duration = (datetime.utcnow() - start_time).total_seconds()
+    duration = time.perf_counter() - start_time
 
     api_metrics.requests_total.labels(
         method=request.method,
@@ -132,10 +232,7 @@ async def health_check():
 # Metrics endpoint
 @app.get("/metrics")
 async def metrics():
-    return JSONResponse(
-        content=generate_latest().decode(),
-        media_type=CONTENT_TYPE_LATEST,
-    )
+    return Response(content=generate_latest(), media_type=CONTENT_TYPE_LATEST)
 
 
 # Flight status endpoints
@@ -164,24 +261,28 @@ async def search_flights(
 ):
     """Search flights with filters."""
     # Build query
-    query = {}
-    if origin:
-        query["origin.code"] = origin.upper()
-    if destination:
-        query["destination.code"] = destination.upper()
-    if airline:
-        query["airline"] = airline
-    if status:
-        query["status"] = status
-    if from_time:
-        query["scheduled_departure"] = {"$gte": from_time}
-    if to_time:
-        query.setdefault("scheduled_departure", {})["$lte"] = to_time
-
-    # Execute query
-    cursor = tracker.mongo.flights.current.find(query).limit(limit)
-    flights = [Flight.model_validate(doc) async for doc in cursor]
-    return flights
+    params = {"origin": origin, "destination": destination, "airline": airline, "status": status}
+    query: Dict[str, Any] = {}
+    for param, field, transform in _FILTERS:
+        value = params[param]
+        if value:
+            query[field] = transform(value) if transform else value
+    if from_time or to_time:
+        rng = {}
+        if from_time:
+            rng["$gte"] = from_time
+        if to_time:
+            rng["$lte"] = to_time
+        query["scheduled_departure"] = rng
+
+    # Stream results instead of materializing the whole cursor
+    hint = _pick_hint(query)
+    cursor = tracker.mongo.flights.current.find(query, FLIGHT_PROJECTION, batch_size=100)
+    if hint:
+        cursor = cursor.hint(hint)
+    cursor = cursor.limit(limit)
+    flights = (Flight.model_validate(doc) async for doc in cursor)
+    return StreamingResponse(_stream_json_array(flights), media_type="application/json")
 
 
 @app.get("/api/flights/{flight_number}/history")
@@ -194,8 +295,8 @@ async def get_flight_history(
     end_date = datetime.utcnow()
     start_date = end_date - timedelta(days=days)
     
-    flights = await tracker.get_historical_data(flight_number, start_date, end_date)
-    return flights
+    flights = tracker.iter_historical_data(flight_number, start_date, end_date)
+    return StreamingResponse(_stream_json_array(flights), media_type="application/json")
 
 
 # Webhook subscription endpoints
@@ -259,21 +360,19 @@ async def get_flight_calendar(
 
 # Background task to retry failed webhook deliveries
 @app.post("/api/webhooks/retry")
-async def retry_failed_webhooks(
-    background_tasks: BackgroundTasks,
-    dispatcher: WebhookDispatcher = Depends(get_webhook_dispatcher),
-):
+async def retry_failed_webhooks(request: Request):
     """Retry failed webhook deliveries."""
-    background_tasks.add_task(dispatcher.retry_failed_deliveries)
-    return {"status": "retry_scheduled"}
-
+    try:
+        request.app.state.retry_queue.put_nowait(None)
+    except asyncio.QueueFull:
+        raise HTTPException(status_code=429, detail="Too many pending retries")
+    return {"status": "queued"}
 
-# Event handlers
-@app.on_event("startup")
-async def startup_event():
-    logger.info("Starting Flight Info service")
 
+# Prefer uvloop when available; uvicorn --loop uvloop does the same for served processes
+try:
+    import uvloop
 
-@app.on_event("shutdown")
-async def shutdown_event():
-    logger.info("Shutting down Flight Info service") 
\ No newline at end of file
+    uvloop.install()
+except ImportError:
+    pass
\ No newline at end of file
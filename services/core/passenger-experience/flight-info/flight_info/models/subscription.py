@@ -1,5 +1,6 @@
 from datetime import datetime
 from enum import Enum
+from functools import cached_property
 from typing import Dict, List, Optional, Any
 
 from pydantic import BaseModel, Field, HttpUrl
@@ -63,6 +64,11 @@ class WebhookSubscription(BaseModel):
     updated_at: datetime = Field(default_factory=datetime.utcnow)
     expires_at: Optional[datetime] = Field(None, description="Subscription expiration date")
 
+    @cached_property
+    def secret_bytes(self) -> bytes:
+        """Signing key, encoded once per subscription instance."""
+        return self.secret.encode()
+
     class Config:
         json_schema_extra = {
             "example": {
@@ -1,19 +1,107 @@
 import asyncio
+import time
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
+from types import MappingProxyType
+from typing import Any, AsyncIterator, Callable, Dict, List, Mapping, NamedTuple, Optional
 
-import aiohttp
+import httpx
+import msgspec
 import structlog
+from cachetools import TTLCache
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ReturnDocument
 from redis.asyncio import Redis
 
-from ..models.flight import Flight, FlightStatus, FlightPosition
+from ..models.flight import Airport, Flight, FlightStatus, FlightPosition
 from ..utils.metrics import flight_tracker_metrics as metrics
 from ..utils.cache import Cache
 
 
 logger = structlog.get_logger(__name__)
 
+INVALIDATION_CHANNEL = "flight_invalidate"
+# Bump when the cached Flight shape changes so old entries are never decoded
+CACHE_KEY_PREFIX = "flight:v2:"
+
+# Fetch exactly the Flight schema and skip _id/legacy fields to cut BSON decode work
+FLIGHT_PROJECTION = {"_id": 0, **{name: 1 for name in Flight.model_fields}}
+VENDOR_CONCURRENCY = 20
+
+
+def make_vendor_client() -> httpx.AsyncClient:
+    """HTTP/2 client so concurrent calls to one vendor multiplex over a single connection."""
+    return httpx.AsyncClient(
+        http2=True,
+        limits=httpx.Limits(max_connections=200, max_keepalive_connections=50),
+        timeout=5.0,
+    )
+
+
+class _VendorAirport(msgspec.Struct):
+    code: str
+    name: str
+    city: str
+    country: str
+    timezone: str
+    location: Dict[str, float]
+    terminals: List[str] = []
+
+
+class _VendorPosition(msgspec.Struct):
+    latitude: float
+    longitude: float
+    altitude: float
+    heading: float
+    groundspeed: float
+    timestamp: datetime
+
+
+class _VendorFlight(msgspec.Struct):
+    """Vendor payload schema, decoded and type-checked straight from response bytes."""
+
+    flight_number: str
+    airline: str
+    origin: _VendorAirport
+    destination: _VendorAirport
+    scheduled_departure: datetime
+    scheduled_arrival: datetime
+    status: FlightStatus
+    position: Optional[_VendorPosition] = None
+
+
+_decode_vendor_flight = msgspec.json.Decoder(_VendorFlight).decode
+
+
+def _airport_from_vendor(airport: _VendorAirport) -> Airport:
+    return Airport.model_construct(**msgspec.structs.asdict(airport))
+
+
+class _Vendor(NamedTuple):
+    name: str
+    url: Callable[[str], str]
+    headers: Mapping[str, str]
+    timeout: httpx.Timeout
+    semaphore: asyncio.Semaphore
+
+
+def _make_url_fn(template: str) -> Callable[[str], str]:
+    """Split a vendor URL template once so requests only concatenate strings."""
+    parts = template.split("{flight_number}")
+    if len(parts) != 2:
+        return lambda flight_number: template.format(flight_number=flight_number)
+    left, right = parts
+    return lambda flight_number: left + flight_number + right
+
+
+def _compile_vendor(config: Dict[str, Any]) -> _Vendor:
+    return _Vendor(
+        name=config["name"],
+        url=_make_url_fn(config["url"]),
+        headers=MappingProxyType(dict(config.get("headers", {}))),
+        timeout=httpx.Timeout(config.get("timeout", 5)),
+        semaphore=asyncio.Semaphore(config.get("max_concurrency", VENDOR_CONCURRENCY)),
+    )
+
 
 class FlightTracker:
     def __init__(
@@ -22,44 +110,84 @@ class FlightTracker:
         redis_client: Redis,
         vendor_configs: List[Dict[str, Any]],
         cache_ttl: int = 300,  # 5 minutes
+        vendor_timeout: float = 5.0,
+        local_cache_size: int = 1024,
+        local_cache_ttl: int = 30,
     ):
         self.mongo = mongo_client
         self.redis = redis_client
         self.cache = Cache(redis_client)
         self.vendor_configs = vendor_configs
+        self._vendors = [_compile_vendor(config) for config in vendor_configs]
         self.cache_ttl = cache_ttl
-        self.session: Optional[aiohttp.ClientSession] = None
-
-    async def start(self):
-        """Initialize the flight tracker service."""
-        self.session = aiohttp.ClientSession()
+        self.vendor_timeout = vendor_timeout
+        self.session: Optional[httpx.AsyncClient] = None
+        self._owns_session = True
+        self._inflight: Dict[str, asyncio.Task] = {}
+        # Per-process hot tier in front of Redis, kept coherent via pub/sub
+        self._local_cache: TTLCache = TTLCache(maxsize=local_cache_size, ttl=local_cache_ttl)
+        self._invalidation_task: Optional[asyncio.Task] = None
+
+    async def start(self, session: Optional[httpx.AsyncClient] = None):
+        """Initialize the flight tracker service, optionally on a shared vendor client."""
+        self._owns_session = session is None
+        self.session = session or make_vendor_client()
+        self._invalidation_task = asyncio.create_task(self._listen_for_invalidations())
         logger.info("Flight tracker service started")
 
     async def stop(self):
         """Cleanup resources."""
-        if self.session:
-            await self.session.close()
+        if self._invalidation_task:
+            self._invalidation_task.cancel()
+            await asyncio.gather(self._invalidation_task, return_exceptions=True)
+        if self.session and self._owns_session:
+            await self.session.aclose()
         logger.info("Flight tracker service stopped")
 
     async def get_flight(self, flight_number: str) -> Optional[Flight]:
         """Get flight information with caching."""
-        cache_key = f"flight:{flight_number}"
-        
-        # Try cache first
-        cached_flight = await self.cache.get(cache_key)
+        cache_key = CACHE_KEY_PREFIX + flight_number
+
+        # Try the in-process cache, then Redis
+        flight = self._local_cache.get(flight_number)
+        if flight is not None:
+            metrics.cache_hits.inc()
+            return flight
+
+        cached_flight = await self.cache.get_raw(cache_key)
         if cached_flight:
             metrics.cache_hits.inc()
-            return Flight.model_validate(cached_flight)
+            # One-pass parse+validate; model_construct would leave nested models as raw dicts
+            flight = Flight.model_validate_json(cached_flight)
+            self._local_cache[flight_number] = flight
+            return flight
 
         metrics.cache_misses.inc()
 
+        # Coalesce concurrent misses for the same flight onto a single load. It runs in its
+        # own task so a cancelled caller does not cancel the load for the others.
+        task = self._inflight.get(flight_number)
+        if task is None:
+            task = asyncio.create_task(self._load_flight(flight_number, cache_key))
+            self._inflight[flight_number] = task
+            task.add_done_callback(lambda _: self._inflight.pop(flight_number, None))
+
+        flight = await asyncio.shield(task)
+        if flight:
+            self._local_cache[flight_number] = flight
+        return flight
+
+    async def _load_flight(self, flight_number: str, cache_key: str) -> Optional[Flight]:
+        """Load a flight from the database or vendors and populate the cache."""
         # Query from database
-        flight_data = await self.mongo.flights.current.find_one({"flight_number": flight_number})
+        flight_data = await self.mongo.flights.current.find_one(
+            {"flight_number": flight_number}, FLIGHT_PROJECTION
+        )
         if flight_data:
             flight = Flight.model_validate(flight_data)
             
             # Update cache
-            await self.cache.set(cache_key, flight.model_dump(), self.cache_ttl)
+            await self.cache.set(cache_key, flight.model_dump_json(), self.cache_ttl)
             
             return flight
 
@@ -72,170 +200,212 @@ class FlightTracker:
                 {"$set": flight.model_dump()},
                 upsert=True
             )
-            await self.cache.set(cache_key, flight.model_dump(), self.cache_ttl)
+            await self.cache.set(cache_key, flight.model_dump_json(), self.cache_ttl)
 
         return flight
 
+    async def _listen_for_invalidations(self) -> None:
+        """Evict local cache entries invalidated by any worker."""
+        while True:
+            pubsub = self.redis.pubsub()
+            try:
+                await pubsub.subscribe(INVALIDATION_CHANNEL)
+                async for message in pubsub.listen():
+                    if message["type"] == "message":
+                        self._local_cache.pop(message["data"].decode(), None)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("Cache invalidation listener error", error=str(e))
+                # Entries may have been missed while disconnected
+                self._local_cache.clear()
+                await asyncio.sleep(1)
+            finally:
+                await pubsub.close()
+
     async def _fetch_from_vendors(self, flight_number: str) -> Optional[Flight]:
         """Fetch flight information from multiple vendors with fallback."""
         tasks = []
-        for vendor in self.vendor_configs:
+        for vendor in self._vendors:
             task = asyncio.create_task(
                 self._fetch_from_vendor(flight_number, vendor),
-                name=f"fetch_{vendor['name']}"
+                name=f"fetch_{vendor.name}"
             )
             tasks.append(task)
 
-        # Wait for first successful response or all failures
+        # Hedge across vendors: take the first non-empty response, then reap the rest
         flight_data = None
-        start_time = datetime.utcnow()
+        start_time = time.perf_counter()
+        pending = set(tasks)
 
-        for completed in asyncio.as_completed(tasks):
-            try:
-                vendor_data = await completed
-                if vendor_data:
-                    flight_data = vendor_data
-                    metrics.vendor_success.inc()
+        try:
+            while pending and flight_data is None:
+                done, pending = await asyncio.wait(
+                    pending,
+                    timeout=self.vendor_timeout,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                if not done:
+                    logger.warning("Vendor fetch timed out", flight_number=flight_number)
                     break
-            except Exception as e:
-                logger.error("Vendor fetch error", error=str(e))
-                metrics.vendor_errors.inc()
 
-        # Cancel remaining tasks
-        for task in tasks:
-            if not task.done():
+                for task in done:
+                    try:
+                        vendor_data = task.result()
+                    except Exception as e:
+                        logger.error("Vendor fetch error", error=str(e))
+                        metrics.vendor_errors.inc()
+                        continue
+                    if vendor_data and flight_data is None:
+                        flight_data = vendor_data
+                        metrics.vendor_success.inc()
+        finally:
+            for task in pending:
                 task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
 
-        latency = (datetime.utcnow() - start_time).total_seconds()
+        latency = time.perf_counter() - start_time
         metrics.vendor_latency.observe(latency)
 
         return flight_data
 
     async def _fetch_from_vendor(
-        self, flight_number: str, vendor_config: Dict[str, Any]
+        self, flight_number: str, vendor: _Vendor
     ) -> Optional[Flight]:
         """Fetch flight information from a single vendor."""
         if not self.session:
             raise RuntimeError("Flight tracker service not started")
 
-        url = vendor_config["url"].format(flight_number=flight_number)
-        headers = vendor_config.get("headers", {})
-        timeout = aiohttp.ClientTimeout(total=vendor_config.get("timeout", 5))
-
         try:
-            async with self.session.get(url, headers=headers, timeout=timeout) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    return self._parse_vendor_response(data, vendor_config["name"])
-                else:
-                    logger.warning(
-                        "Vendor request failed",
-                        vendor=vendor_config["name"],
-                        status=response.status
-                    )
-                    return None
+            async with vendor.semaphore:
+                response = await self.session.get(
+                    vendor.url(flight_number), headers=vendor.headers, timeout=vendor.timeout
+                )
+            if response.status_code == 200:
+                return self._parse_vendor_response(response.content, vendor.name)
+            else:
+                logger.warning(
+                    "Vendor request failed",
+                    vendor=vendor.name,
+                    status=response.status_code
+                )
+                return None
         except Exception as e:
             logger.error(
                 "Vendor request error",
-                vendor=vendor_config["name"],
+                vendor=vendor.name,
                 error=str(e)
             )
             return None
 
-    def _parse_vendor_response(self, data: Dict[str, Any], vendor: str) -> Optional[Flight]:
+    def _parse_vendor_response(self, raw: bytes, vendor: str) -> Optional[Flight]:
         """Parse vendor-specific response into Flight model."""
         try:
-            # Implement vendor-specific parsing logic
-            # This is a simplified example
-            return Flight(
-                flight_number=data["flight_number"],
-                airline=data["airline"],
-                origin=data["origin"],
-                destination=data["destination"],
-                scheduled_departure=data["scheduled_departure"],
-                scheduled_arrival=data["scheduled_arrival"],
-                status=FlightStatus(data["status"]),
-                position=FlightPosition(**data["position"]) if "position" in data else None,
+            # msgspec has already type-checked every field, so skip pydantic validation
+            data = _decode_vendor_flight(raw)
+            position = data.position
+            return Flight.model_construct(
+                flight_number=data.flight_number,
+                airline=data.airline,
+                origin=_airport_from_vendor(data.origin),
+                destination=_airport_from_vendor(data.destination),
+                scheduled_departure=data.scheduled_departure,
+                scheduled_arrival=data.scheduled_arrival,
+                status=data.status,
+                position=(
+                    FlightPosition.model_construct(**msgspec.structs.asdict(position))
+                    if position is not None
+                    else None
+                ),
             )
         except Exception as e:
             logger.error("Vendor response parsing error", vendor=vendor, error=str(e))
             return None
 
-    async def get_historical_data(
+    async def iter_historical_data(
         self, flight_number: str, start_date: datetime, end_date: datetime
-    ) -> List[Flight]:
-        """Get historical flight data."""
+    ) -> AsyncIterator[Flight]:
+        """Stream historical flight data in cursor-sized batches."""
         cursor = self.mongo.flights.historical.find({
             "flight_number": flight_number,
             "scheduled_departure": {"$gte": start_date, "$lte": end_date}
-        }).sort("scheduled_departure", 1)
+        }, FLIGHT_PROJECTION, batch_size=100).sort("scheduled_departure", 1)
 
-        return [Flight.model_validate(doc) async for doc in cursor]
+        async for doc in cursor:
+            yield Flight.model_validate(doc)
+
+    async def get_historical_data(
+        self, flight_number: str, start_date: datetime, end_date: datetime
+    ) -> List[Flight]:
+        """Get historical flight data."""
+        return [
+            flight
+            async for flight in self.iter_historical_data(flight_number, start_date, end_date)
+        ]
 
     async def calculate_delay_estimate(self, flight: Flight) -> Optional[timedelta]:
         """Calculate estimated delay based on historical data and current conditions."""
         if flight.status not in [FlightStatus.DELAYED, FlightStatus.SCHEDULED]:
             return None
 
-        # Get historical delays for this flight number
+        # Average historical arrival delay server-side; $subtract on dates yields milliseconds
         one_month_ago = datetime.utcnow() - timedelta(days=30)
-        historical_flights = await self.get_historical_data(
-            flight.flight_number,
-            one_month_ago,
-            datetime.utcnow()
-        )
-
-        if not historical_flights:
-            return None
-
-        # Calculate average delay
-        delays = []
-        for hist_flight in historical_flights:
-            if hist_flight.actual_arrival and hist_flight.scheduled_arrival:
-                delay = hist_flight.actual_arrival - hist_flight.scheduled_arrival
-                delays.append(delay.total_seconds() / 60)  # Convert to minutes
-
-        if not delays:
+        pipeline = [
+            {
+                "$match": {
+                    "flight_number": flight.flight_number,
+                    "scheduled_departure": {"$gte": one_month_ago, "$lte": datetime.utcnow()},
+                    "actual_arrival": {"$ne": None},
+                    "scheduled_arrival": {"$ne": None},
+                }
+            },
+            {"$project": {"delay": {"$subtract": ["$actual_arrival", "$scheduled_arrival"]}}},
+            {"$group": {"_id": None, "avg_delay_ms": {"$avg": "$delay"}}},
+        ]
+        cursor = self.mongo.flights.historical.aggregate(pipeline)
+        result = await cursor.to_list(length=1)
+
+        if not result or result[0]["avg_delay_ms"] is None:
             return None
 
-        avg_delay = sum(delays) / len(delays)
-        return timedelta(minutes=avg_delay)
+        return timedelta(milliseconds=result[0]["avg_delay_ms"])
 
     async def update_flight_status(
         self, flight_number: str, status: FlightStatus, metadata: Optional[Dict[str, Any]] = None
     ) -> Optional[Flight]:
         """Update flight status and notify subscribers."""
-        flight = await self.get_flight(flight_number)
-        if not flight:
-            return None
-
-        update_data = {
+        update_data: Dict[str, Any] = {
             "status": status,
             "updated_at": datetime.utcnow()
         }
         if metadata:
-            update_data["metadata"] = {**flight.metadata, **metadata}
+            # Merge metadata server-side so no pre-image read is needed
+            for key, value in metadata.items():
+                update_data[f"metadata.{key}"] = value
 
-        # Update in database
-        result = await self.mongo.flights.current.update_one(
+        # Update in database and read back the post-image in one round-trip
+        updated_doc = await self.mongo.flights.current.find_one_and_update(
             {"flight_number": flight_number},
-            {"$set": update_data}
+            {"$set": update_data},
+            projection=FLIGHT_PROJECTION,
+            return_document=ReturnDocument.AFTER
         )
+        if not updated_doc:
+            return None
 
-        if result.modified_count > 0:
-            # Invalidate cache
-            await self.cache.delete(f"flight:{flight_number}")
-            
-            # Get updated flight
-            updated_flight = await self.get_flight(flight_number)
-            if updated_flight:
-                metrics.status_updates.inc()
-                logger.info(
-                    "Flight status updated",
-                    flight_number=flight_number,
-                    old_status=flight.status,
-                    new_status=status
-                )
-            return updated_flight
+        updated_flight = Flight.model_validate(updated_doc)
 
-        return None 
\ No newline at end of file
+        # Overwrite the cached entry with the fresh document and evict stale local copies
+        await self.cache.set(
+            CACHE_KEY_PREFIX + flight_number, updated_flight.model_dump_json(), self.cache_ttl
+        )
+        self._local_cache.pop(flight_number, None)
+        await self.redis.publish(INVALIDATION_CHANNEL, flight_number)
+
+        metrics.status_updates.labels(status=status.value).inc()
+        logger.info(
+            "Flight status updated",
+            flight_number=flight_number,
+            new_status=status
+        )
+        return updated_flight
\ No newline at end of file
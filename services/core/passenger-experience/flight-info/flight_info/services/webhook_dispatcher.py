@@ -1,14 +1,17 @@
 import asyncio
 import hmac
-import hashlib
-import json
 import time
+import uuid
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 
 import aiohttp
+import orjson
 import structlog
+from cachetools import TTLCache
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ReturnDocument, UpdateOne
+from pymongo.errors import OperationFailure
 from redis.asyncio import Redis
 
 from ..models.subscription import (
@@ -23,6 +26,34 @@ from ..utils.metrics import webhook_metrics as metrics
 
 logger = structlog.get_logger(__name__)
 
+SUBSCRIPTION_INVALIDATION_CHANNEL = "sub_invalidate"
+STATS_FLUSH_INTERVAL = 0.1  # seconds
+STATS_FLUSH_BATCH = 500
+DLQ_TTL_SECONDS = 7 * 24 * 3600
+# How long a drainer owns the DLQ entries it claimed before others may take them
+DLQ_LEASE_SECONDS = 60
+# Longest the drainer sleeps between DLQ checks; the only trigger without change streams
+DLQ_POLL_INTERVAL = 30.0
+
+# Fetch exactly the subscription schema and skip _id/legacy fields
+SUBSCRIPTION_PROJECTION = {"_id": 0, **{name: 1 for name in WebhookSubscription.model_fields}}
+
+
+def make_webhook_session() -> aiohttp.ClientSession:
+    """Keep-alive session so repeat deliveries to a callback host reuse TCP/TLS connections."""
+    connector = aiohttp.TCPConnector(
+        limit=200,
+        limit_per_host=32,
+        keepalive_timeout=75,
+        ttl_dns_cache=300,
+        enable_cleanup_closed=True,
+    )
+    return aiohttp.ClientSession(
+        connector=connector,
+        timeout=aiohttp.ClientTimeout(total=5),
+        json_serialize=lambda obj: orjson.dumps(obj).decode(),
+    )
+
 
 class WebhookDispatcher:
     def __init__(
@@ -31,21 +62,74 @@ class WebhookDispatcher:
         redis_client: Redis,
         dlq_name: str = "webhook_dlq",
         max_concurrent_deliveries: int = 50,
+        subscription_cache_size: int = 10_000,
+        subscription_cache_ttl: int = 60,
+        url_validation_ttl: int = 300,
+        dlq_retry_delay: float = 5.0,
     ):
         self.mongo = mongo_client
         self.redis = redis_client
         self.dlq_name = dlq_name
         self.session: Optional[aiohttp.ClientSession] = None
+        self._owns_session = True
         self.semaphore = asyncio.Semaphore(max_concurrent_deliveries)
-
-    async def start(self):
-        """Initialize the webhook dispatcher service."""
-        self.session = aiohttp.ClientSession()
+        # Subscriptions rarely change; evictions are broadcast to every worker
+        self._sub_cache: TTLCache = TTLCache(
+            maxsize=subscription_cache_size, ttl=subscription_cache_ttl
+        )
+        self._invalidation_task: Optional[asyncio.Task] = None
+        # Callback URLs that recently passed the reachability probe
+        self._valid_urls: TTLCache = TTLCache(maxsize=10_000, ttl=url_validation_ttl)
+        # Delivery stats are bookkeeping; write them in batches off the delivery path
+        self._stats_queue: asyncio.Queue[Tuple[List[str], bool, DeliveryAttempt]] = asyncio.Queue()
+        self._stats_task: Optional[asyncio.Task] = None
+        # DLQ inserts wake the retry drain instead of polling
+        self.dlq_retry_delay = dlq_retry_delay
+        self._dlq_pending = asyncio.Event()
+        self._dlq_tasks: List[asyncio.Task] = []
+        # Identifies this worker's DLQ claims when several drainers run at once
+        self._worker_id = uuid.uuid4().hex
+
+    async def ensure_indexes(self) -> None:
+        """Create the indices backing webhook storage."""
+        await self.mongo.subscriptions.create_index("id", unique=True)
+        await self.mongo.subscriptions.create_index("flight_numbers")
+        # Undeliverable entries expire instead of accumulating forever
+        await self.mongo[self.dlq_name].create_index(
+            "timestamp", expireAfterSeconds=DLQ_TTL_SECONDS
+        )
+        await self.mongo[self.dlq_name].create_index("next_retry_at")
+
+    async def start(self, session: Optional[aiohttp.ClientSession] = None):
+        """Initialize the webhook dispatcher service, optionally on a shared HTTP session."""
+        self._owns_session = session is None
+        self.session = session or make_webhook_session()
+        self._invalidation_task = asyncio.create_task(self._listen_for_invalidations())
+        self._stats_task = asyncio.create_task(self._flush_delivery_stats())
+        self._dlq_tasks = [
+            asyncio.create_task(self._watch_dlq()),
+            asyncio.create_task(self._drain_dlq()),
+        ]
         logger.info("Webhook dispatcher service started")
 
     async def stop(self):
         """Cleanup resources."""
-        if self.session:
+        for task in self._dlq_tasks:
+            task.cancel()
+        await asyncio.gather(*self._dlq_tasks, return_exceptions=True)
+        if self._invalidation_task:
+            self._invalidation_task.cancel()
+            await asyncio.gather(self._invalidation_task, return_exceptions=True)
+        if self._stats_task:
+            self._stats_task.cancel()
+            await asyncio.gather(self._stats_task, return_exceptions=True)
+            # Persist whatever was still queued
+            pending = []
+            while not self._stats_queue.empty():
+                pending.append(self._stats_queue.get_nowait())
+            if pending:
+                await self._write_delivery_stats(pending)
+        if self.session and self._owns_session:
             await self.session.close()
         logger.info("Webhook dispatcher service stopped")
 
@@ -62,8 +146,11 @@ class WebhookDispatcher:
         subscription.id = str(result.inserted_id)
 
         # Index subscription by flight numbers
-        for flight_number in subscription.flight_numbers:
-            await self.redis.sadd(f"flight_subs:{flight_number}", subscription.id)
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for flight_number in subscription.flight_numbers:
+                pipe.sadd(f"flight_subs:{flight_number}", subscription.id)
+            await pipe.execute()
+        await self._invalidate_subscriptions([subscription.id])
 
         metrics.subscriptions_created.inc()
         logger.info(
@@ -86,8 +173,11 @@ class WebhookDispatcher:
             return False
 
         # Remove from flight number indices
-        for flight_number in subscription.flight_numbers:
-            await self.redis.srem(f"flight_subs:{flight_number}", subscription_id)
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for flight_number in subscription.flight_numbers:
+                pipe.srem(f"flight_subs:{flight_number}", subscription_id)
+            await pipe.execute()
+        await self._invalidate_subscriptions([subscription_id])
 
         metrics.subscriptions_deleted.inc()
         logger.info("Webhook subscription deleted", subscription_id=subscription_id)
@@ -96,29 +186,109 @@ class WebhookDispatcher:
 
     async def get_subscription(self, subscription_id: str) -> Optional[WebhookSubscription]:
         """Get a webhook subscription by ID."""
-        doc = await self.mongo.subscriptions.find_one({"id": subscription_id})
-        return WebhookSubscription.model_validate(doc) if doc else None
+        subscription = self._sub_cache.get(subscription_id)
+        if subscription is not None:
+            return subscription
+
+        doc = await self.mongo.subscriptions.find_one(
+            {"id": subscription_id}, SUBSCRIPTION_PROJECTION
+        )
+        if not doc:
+            return None
+        subscription = WebhookSubscription.model_validate(doc)
+        self._sub_cache[subscription_id] = subscription
+        return subscription
+
+    async def _invalidate_subscriptions(self, subscription_ids: List[str]) -> None:
+        """Evict subscriptions locally and tell other workers to do the same."""
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for subscription_id in subscription_ids:
+                self._sub_cache.pop(subscription_id, None)
+                pipe.publish(SUBSCRIPTION_INVALIDATION_CHANNEL, subscription_id)
+            await pipe.execute()
+
+    async def _listen_for_invalidations(self) -> None:
+        """Evict subscription cache entries invalidated by any worker."""
+        while True:
+            pubsub = self.redis.pubsub()
+            try:
+                await pubsub.subscribe(SUBSCRIPTION_INVALIDATION_CHANNEL)
+                async for message in pubsub.listen():
+                    if message["type"] == "message":
+                        self._sub_cache.pop(message["data"].decode(), None)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("Subscription invalidation listener error", error=str(e))
+                # Entries may have been missed while disconnected
+                self._sub_cache.clear()
+                await asyncio.sleep(1)
+            finally:
+                await pubsub.close()
+
+    async def _get_active_subscriptions(
+        self, subscription_ids: List[str]
+    ) -> List[WebhookSubscription]:
+        """Resolve active subscriptions from the cache, fetching only the misses from Mongo."""
+        found = []
+        missing = []
+        for subscription_id in subscription_ids:
+            subscription = self._sub_cache.get(subscription_id)
+            if subscription is None:
+                missing.append(subscription_id)
+            else:
+                found.append(subscription)
+
+        if missing:
+            # Inactive ones are cached too, so they are not refetched on every fan-out
+            cursor = self.mongo.subscriptions.find(
+                {"id": {"$in": missing}}, SUBSCRIPTION_PROJECTION
+            )
+            for doc in await cursor.to_list(length=len(missing)):
+                subscription = WebhookSubscription.model_validate(doc)
+                self._sub_cache[subscription.id] = subscription
+                found.append(subscription)
+
+        return [sub for sub in found if sub.status == WebhookStatus.ACTIVE]
 
     async def get_subscriptions_for_flight(self, flight_number: str) -> List[WebhookSubscription]:
         """Get all active subscriptions for a flight number."""
         subscription_ids = await self.redis.smembers(f"flight_subs:{flight_number}")
-        subscriptions = []
-
-        for sub_id in subscription_ids:
-            subscription = await self.get_subscription(sub_id.decode())
-            if subscription and subscription.status == WebhookStatus.ACTIVE:
-                subscriptions.append(subscription)
+        return await self._get_active_subscriptions(
+            [sub_id.decode() for sub_id in subscription_ids]
+        )
 
-        return subscriptions
+    async def get_subscriptions_for_flights(
+        self, flight_numbers: List[str]
+    ) -> Dict[str, List[WebhookSubscription]]:
+        """Get active subscriptions for several flights with one Redis round-trip."""
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for flight_number in flight_numbers:
+                pipe.smembers(f"flight_subs:{flight_number}")
+            members = await pipe.execute()
+
+        ids_by_flight = {
+            flight_number: {sub_id.decode() for sub_id in sub_ids}
+            for flight_number, sub_ids in zip(flight_numbers, members)
+        }
+        all_ids = set().union(*ids_by_flight.values())
+        subscriptions = {
+            sub.id: sub for sub in await self._get_active_subscriptions(list(all_ids))
+        }
+        return {
+            flight_number: [subscriptions[sub_id] for sub_id in sub_ids if sub_id in subscriptions]
+            for flight_number, sub_ids in ids_by_flight.items()
+        }
 
+    @staticmethod
     def _should_notify(
-        self, subscription: WebhookSubscription, event: SubscriptionEvent, flight: Flight
+        subscription: WebhookSubscription, event: SubscriptionEvent, flight: Flight
     ) -> bool:
         """Check if a subscription should be notified of an event."""
         if event not in subscription.events and SubscriptionEvent.ALL not in subscription.events:
             return False
 
-        # Apply filters
+        # Apply filters; subscriptions without the filter always match
         filters = subscription.filters
         if event == SubscriptionEvent.DELAY and "min_delay_minutes" in filters:
             if not flight.delay or flight.delay.duration < filters["min_delay_minutes"]:
@@ -130,34 +300,36 @@ class WebhookDispatcher:
 
         return True
 
-    def _generate_signature(self, payload: str, secret: str) -> str:
+    def _generate_signature(self, payload: bytes, secret: bytes) -> str:
         """Generate HMAC signature for webhook payload."""
-        return hmac.new(
-            secret.encode(),
-            payload.encode(),
-            hashlib.sha256
-        ).hexdigest()
+        return hmac.digest(secret, payload, "sha256").hex()
 
     async def notify_flight_update(
         self, flight: Flight, event: SubscriptionEvent
     ) -> None:
         """Notify all subscribers about a flight update."""
+        # Subscriptions come from the in-process cache; event and filters are matched here
         subscriptions = await self.get_subscriptions_for_flight(flight.flight_number)
-        
+
         # Group subscriptions by callback URL for batching
         url_subscriptions: Dict[str, List[WebhookSubscription]] = {}
         for sub in subscriptions:
-            if self._should_notify(sub, event, flight):
-                url = str(sub.callback_url)
-                if url not in url_subscriptions:
-                    url_subscriptions[url] = []
-                url_subscriptions[url].append(sub)
+            if not self._should_notify(sub, event, flight):
+                continue
+            url = str(sub.callback_url)
+            if url not in url_subscriptions:
+                url_subscriptions[url] = []
+            url_subscriptions[url].append(sub)
+
+        # Dump and encode the flight once for every batch
+        flight_dump = flight.model_dump(mode="json")
+        flight_json = orjson.Fragment(orjson.dumps(flight_dump))
 
         # Process each batch
         tasks = []
         for url, subs in url_subscriptions.items():
             task = asyncio.create_task(
-                self._deliver_batch(url, subs, flight, event)
+                self._deliver_batch(url, subs, flight_dump, event, flight_json)
             )
             tasks.append(task)
 
@@ -168,180 +340,382 @@ class WebhookDispatcher:
         self,
         url: str,
         subscriptions: List[WebhookSubscription],
-        flight: Flight,
+        flight: Dict[str, Any],
         event: SubscriptionEvent,
-    ) -> None:
-        """Deliver a batch of notifications to the same URL."""
-        async with self.semaphore:
-            payload = {
-                "event": event,
-                "timestamp": datetime.utcnow().isoformat(),
-                "flight": flight.model_dump(),
-                "subscription_ids": [sub.id for sub in subscriptions]
-            }
-            payload_json = json.dumps(payload)
-
-            # Generate signatures for each subscription
-            signatures = {
-                sub.id: self._generate_signature(payload_json, sub.secret)
-                for sub in subscriptions
-            }
+        flight_json: Optional[orjson.Fragment] = None,
+        dlq_item: Optional[Dict[str, Any]] = None,
+    ) -> bool:
+        """Deliver a batch of notifications to the same URL, returning whether it succeeded.
+
+        ``dlq_item`` is the claimed DLQ entry when this is a retry.
+        """
+        # One wall-clock read per batch; latency uses the monotonic clock
+        now = datetime.utcnow()
+        payload = {
+            "event": event,
+            "timestamp": now.isoformat(),
+            "flight": flight,
+            "subscription_ids": [sub.id for sub in subscriptions]
+        }
+        # Serialize once: the same bytes are signed and sent, embedding the pre-encoded flight
+        payload_bytes = orjson.dumps(
+            {**payload, "flight": flight_json} if flight_json is not None else payload,
+            default=str
+        )
 
-            headers = {
-                "Content-Type": "application/json",
-                "User-Agent": "AeroFusion-Webhook/1.0",
-                "X-Event-Type": event,
-                "X-Webhook-Signatures": json.dumps(signatures)
-            }
+        # Generate signatures for each subscription, once per distinct secret
+        signature_by_secret: Dict[bytes, str] = {}
+        signatures = {}
+        for sub in subscriptions:
+            signature = signature_by_secret.get(sub.secret_bytes)
+            if signature is None:
+                signature = self._generate_signature(payload_bytes, sub.secret_bytes)
+                signature_by_secret[sub.secret_bytes] = signature
+            signatures[sub.id] = signature
+
+        headers = {
+            "Content-Type": "application/json",
+            "User-Agent": "AeroFusion-Webhook/1.0",
+            "X-Event-Type": event,
+            "X-Webhook-Signatures": orjson.dumps(signatures).decode()
+        }
 
-            start_time = time.time()
-            try:
+        # The semaphore bounds in-flight HTTP only; payload and DB work happen outside it
+        start_time = time.monotonic()
+        try:
+            async with self.semaphore:
+                start_time = time.monotonic()
                 async with self.session.post(
                     url,
-                    json=payload,
+                    data=payload_bytes,
                     headers=headers,
                     timeout=aiohttp.ClientTimeout(total=5)
                 ) as response:
-                    latency = time.time() - start_time
-                    metrics.webhook_latency.observe(latency)
-
                     response_body = await response.text()
-                    success = 200 <= response.status < 300
+                    status_code = response.status
+                latency = time.monotonic() - start_time
+
+        except Exception as e:
+            latency = time.monotonic() - start_time
+            delivery_attempt = DeliveryAttempt(
+                timestamp=now,
+                status_code=0,
+                error=str(e),
+                latency=latency
+            )
 
-                    delivery_attempt = DeliveryAttempt(
-                        timestamp=datetime.utcnow(),
-                        status_code=response.status,
-                        response_body=response_body,
-                        latency=latency
-                    )
+            self._update_delivery_stats(
+                subscriptions,
+                False,
+                delivery_attempt
+            )
+            await self._handle_delivery_failure(
+                subscriptions,
+                payload,
+                delivery_attempt,
+                dlq_item
+            )
+            return False
 
-                    await self._update_delivery_stats(
-                        subscriptions,
-                        success,
-                        delivery_attempt
-                    )
+        metrics.webhook_latency.observe(latency)
+        success = 200 <= status_code < 300
 
-                    if not success:
-                        await self._handle_delivery_failure(
-                            subscriptions,
-                            payload,
-                            delivery_attempt
-                        )
-                    else:
-                        metrics.webhook_success.inc()
-                        logger.info(
-                            "Webhook delivery successful",
-                            url=url,
-                            subscription_ids=[sub.id for sub in subscriptions],
-                            latency=latency
-                        )
+        delivery_attempt = DeliveryAttempt(
+            timestamp=now,
+            status_code=status_code,
+            response_body=response_body,
+            latency=latency
+        )
 
-            except Exception as e:
-                latency = time.time() - start_time
-                delivery_attempt = DeliveryAttempt(
-                    timestamp=datetime.utcnow(),
-                    status_code=0,
-                    error=str(e),
-                    latency=latency
-                )
+        self._update_delivery_stats(
+            subscriptions,
+            success,
+            delivery_attempt
+        )
 
-                await self._handle_delivery_failure(
-                    subscriptions,
-                    payload,
-                    delivery_attempt
-                )
+        if not success:
+            await self._handle_delivery_failure(
+                subscriptions,
+                payload,
+                delivery_attempt,
+                dlq_item
+            )
+        else:
+            metrics.webhook_success.inc()
+            logger.info(
+                "Webhook delivery successful",
+                url=url,
+                subscription_ids=[sub.id for sub in subscriptions],
+                latency=latency
+            )
+        return success
 
-    async def _update_delivery_stats(
+    def _update_delivery_stats(
         self,
         subscriptions: List[WebhookSubscription],
         success: bool,
         attempt: DeliveryAttempt
     ) -> None:
-        """Update delivery statistics for subscriptions."""
-        for sub in subscriptions:
-            update = {
-                "$inc": {
-                    "delivery_stats.total_attempts": 1,
-                    f"delivery_stats.{'successful' if success else 'failed'}": 1
-                },
-                "$set": {
-                    "last_delivery_attempt": attempt.model_dump(),
-                    "updated_at": datetime.utcnow()
-                }
-            }
+        """Queue a delivery statistics update for subscriptions."""
+        if subscriptions:
+            self._stats_queue.put_nowait(([sub.id for sub in subscriptions], success, attempt))
 
-            await self.mongo.subscriptions.update_one(
-                {"id": sub.id},
-                update
-            )
+    async def _flush_delivery_stats(self) -> None:
+        """Collect queued stats updates for up to STATS_FLUSH_INTERVAL and write them together."""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._stats_queue.get()]
+            deadline = loop.time() + STATS_FLUSH_INTERVAL
+            while len(batch) < STATS_FLUSH_BATCH:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._stats_queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            try:
+                await self._write_delivery_stats(batch)
+            except Exception as e:
+                logger.error("Delivery stats flush failed", error=str(e), updates=len(batch))
+
+    async def _write_delivery_stats(
+        self, batch: List[Tuple[List[str], bool, DeliveryAttempt]]
+    ) -> None:
+        """Merge queued updates per subscription and apply them in one bulk_write."""
+        counters: Dict[str, Dict[str, int]] = {}
+        last_attempts: Dict[str, DeliveryAttempt] = {}
+        for subscription_ids, success, attempt in batch:
+            outcome = f"delivery_stats.{'successful' if success else 'failed'}"
+            for sub_id in subscription_ids:
+                inc = counters.setdefault(sub_id, {"delivery_stats.total_attempts": 0})
+                inc["delivery_stats.total_attempts"] += 1
+                inc[outcome] = inc.get(outcome, 0) + 1
+                last_attempts[sub_id] = attempt
+
+        now = datetime.utcnow()
+        await self.mongo.subscriptions.bulk_write(
+            [
+                UpdateOne(
+                    {"id": sub_id},
+                    {
+                        "$inc": inc,
+                        "$set": {
+                            "last_delivery_attempt": last_attempts[sub_id].model_dump(),
+                            "updated_at": now
+                        }
+                    }
+                )
+                for sub_id, inc in counters.items()
+            ],
+            ordered=False
+        )
 
     async def _handle_delivery_failure(
         self,
         subscriptions: List[WebhookSubscription],
         payload: Dict[str, Any],
-        attempt: DeliveryAttempt
+        attempt: DeliveryAttempt,
+        dlq_item: Optional[Dict[str, Any]] = None
     ) -> None:
-        """Handle webhook delivery failure."""
+        """Schedule the next retry of a failed delivery, or give up once attempts run out."""
         metrics.webhook_failures.inc()
 
-        # Add to dead letter queue
-        dlq_item = {
-            "payload": payload,
-            "subscription_ids": [sub.id for sub in subscriptions],
-            "attempt": attempt.model_dump(),
-            "timestamp": datetime.utcnow()
-        }
-        await self.mongo[self.dlq_name].insert_one(dlq_item)
+        # Subscriptions in a batch share a callback URL; the first one's policy applies
+        retry_config = subscriptions[0].retry_config
+        attempts = dlq_item.get("attempts", 1) + 1 if dlq_item else 1
+        exhausted = attempts >= retry_config["max_attempts"]
+        next_retry_at = None if exhausted else datetime.utcnow() + timedelta(
+            seconds=self._retry_delay(retry_config, attempts)
+        )
 
-        # Update subscription status if max retries exceeded
-        for sub in subscriptions:
-            if sub.delivery_stats["failed"] >= sub.retry_config["max_attempts"]:
-                await self.mongo.subscriptions.update_one(
-                    {"id": sub.id},
-                    {
-                        "$set": {
-                            "status": WebhookStatus.FAILED,
-                            "updated_at": datetime.utcnow()
-                        }
-                    }
-                )
+        dlq = self.mongo[self.dlq_name]
+        if dlq_item is None:
+            # The original timestamp is kept across retries so the TTL index still applies
+            await dlq.insert_one({
+                "payload": payload,
+                "subscription_ids": [sub.id for sub in subscriptions],
+                "attempt": attempt.model_dump(),
+                "attempts": attempts,
+                "next_retry_at": next_retry_at,
+                "timestamp": attempt.timestamp
+            })
+        else:
+            # Updated in place: the change stream only wakes the drainer on inserts
+            await dlq.update_one(
+                {"_id": dlq_item["_id"], "owner": self._worker_id},
+                {
+                    "$set": {
+                        "attempt": attempt.model_dump(),
+                        "attempts": attempts,
+                        "next_retry_at": next_retry_at
+                    },
+                    "$unset": {"lease_until": "", "owner": ""}
+                }
+            )
+
+        # Out of attempts: the entry stays in the DLQ until it expires, unscheduled
+        if exhausted:
+            failed = [sub.id for sub in subscriptions]
+            await self.mongo.subscriptions.bulk_write(
+                [
+                    UpdateOne(
+                        {"id": sub_id},
+                        {"$set": {"status": WebhookStatus.FAILED, "updated_at": attempt.timestamp}}
+                    )
+                    for sub_id in failed
+                ],
+                ordered=False
+            )
+            await self._invalidate_subscriptions(failed)
 
         logger.error(
             "Webhook delivery failed",
             subscription_ids=[sub.id for sub in subscriptions],
             error=attempt.error,
-            status_code=attempt.status_code
+            status_code=attempt.status_code,
+            attempts=attempts
         )
 
+    @staticmethod
+    def _retry_delay(retry_config: Dict[str, Any], attempts: int) -> float:
+        """Exponential backoff before the retry following the given number of attempts."""
+        delay = retry_config["initial_delay"] * retry_config["backoff_factor"] ** (attempts - 1)
+        return min(delay, retry_config["max_delay"])
+
     async def _validate_callback_url(self, url: str) -> bool:
         """Validate that a callback URL is reachable."""
+        url = str(url)
+        if url in self._valid_urls:
+            return True
+
         try:
             async with self.session.head(
                 url,
                 timeout=aiohttp.ClientTimeout(total=5)
             ) as response:
-                return response.status < 400
+                valid = response.status < 400
         except Exception:
             return False
 
-    async def retry_failed_deliveries(self) -> None:
-        """Retry failed webhook deliveries from the DLQ."""
+        if valid:
+            self._valid_urls[url] = True
+        return valid
+
+    async def _watch_dlq(self) -> None:
+        """Flag pending retries whenever a failed delivery lands in the DLQ."""
+        while True:
+            try:
+                async with self.mongo[self.dlq_name].watch(
+                    [{"$match": {"operationType": "insert"}}]
+                ) as stream:
+                    # Drain anything queued before the stream opened
+                    self._dlq_pending.set()
+                    async for _ in stream:
+                        self._dlq_pending.set()
+            except asyncio.CancelledError:
+                raise
+            except OperationFailure as e:
+                # Standalone servers have no change streams; the drainer's polling covers it
+                logger.warning("DLQ change stream unavailable, polling instead", error=str(e))
+                return
+            except Exception as e:
+                logger.error("DLQ change stream error", error=str(e))
+                await asyncio.sleep(1)
+
+    async def _drain_dlq(self) -> None:
+        """Retry DLQ entries as they come due, woken early when new failures arrive."""
+        while True:
+            try:
+                timeout = await self._next_dlq_wait()
+                try:
+                    await asyncio.wait_for(self._dlq_pending.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+                else:
+                    # Let a burst of new failures batch up
+                    await asyncio.sleep(self.dlq_retry_delay)
+                self._dlq_pending.clear()
+                await self.retry_failed_deliveries()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("DLQ retry failed", error=str(e))
+                await asyncio.sleep(1)
+
+    async def _next_dlq_wait(self) -> float:
+        """Seconds until the earliest scheduled retry, capped at DLQ_POLL_INTERVAL."""
+        item = await self.mongo[self.dlq_name].find_one(
+            {"next_retry_at": {"$ne": None}}, {"next_retry_at": 1}, sort=[("next_retry_at", 1)]
+        )
+        if item is None:
+            return DLQ_POLL_INTERVAL
+        wait = (item["next_retry_at"] - datetime.utcnow()).total_seconds()
+        # Floored so an entry leased by another drainer does not turn this into a spin
+        return min(DLQ_POLL_INTERVAL, max(1.0, wait))
+
+    async def retry_failed_deliveries(self, batch_size: int = 100) -> None:
+        """Retry the webhook deliveries in the DLQ that are due."""
+        dlq = self.mongo[self.dlq_name]
+
         while True:
-            dlq_item = await self.mongo[self.dlq_name].find_one_and_delete({})
-            if not dlq_item:
+            dlq_items = await self._claim_dlq_items(batch_size)
+            if not dlq_items:
                 break
 
-            subscriptions = []
-            for sub_id in dlq_item["subscription_ids"]:
-                sub = await self.get_subscription(sub_id)
-                if sub and sub.status == WebhookStatus.ACTIVE:
-                    subscriptions.append(sub)
+            # Resolve every subscription referenced by the batch in one query
+            subscription_ids = {
+                sub_id for item in dlq_items for sub_id in item["subscription_ids"]
+            }
+            active = {
+                sub.id: sub
+                for sub in await self._get_active_subscriptions(list(subscription_ids))
+            }
 
-            if subscriptions:
+            # Deliveries fan out concurrently, bounded by the delivery semaphore
+            tasks = []
+            retried = []
+            done = []
+            for dlq_item in dlq_items:
+                subscriptions = [
+                    active[sub_id] for sub_id in dlq_item["subscription_ids"] if sub_id in active
+                ]
+                if not subscriptions:
+                    # Nobody left to deliver to
+                    done.append(dlq_item["_id"])
+                    continue
                 url = str(subscriptions[0].callback_url)
-                await self._deliver_batch(
-                    url,
-                    subscriptions,
-                    Flight.model_validate(dlq_item["payload"]["flight"]),
-                    SubscriptionEvent(dlq_item["payload"]["event"])
-                ) 
\ No newline at end of file
+                tasks.append(
+                    self._deliver_batch(
+                        url,
+                        subscriptions,
+                        dlq_item["payload"]["flight"],
+                        SubscriptionEvent(dlq_item["payload"]["event"]),
+                        dlq_item=dlq_item
+                    )
+                )
+                retried.append(dlq_item["_id"])
+            results = await asyncio.gather(*tasks, return_exceptions=True)
+            # Failed retries rescheduled themselves; entries that raise wait out their lease
+            done.extend(item_id for item_id, result in zip(retried, results) if result is True)
+            if done:
+                # Entries whose lease lapsed mid-retry now belong to another drainer
+                await dlq.delete_many({"_id": {"$in": done}, "owner": self._worker_id})
+
+    async def _claim_dlq_items(self, batch_size: int) -> List[Dict[str, Any]]:
+        """Lease up to batch_size due DLQ entries so no other drainer retries them too."""
+        dlq = self.mongo[self.dlq_name]
+        now = datetime.utcnow()
+        lease_until = now + timedelta(seconds=DLQ_LEASE_SECONDS)
+        claimed = []
+        while len(claimed) < batch_size:
+            # Each claim is a single atomic update; expired leases can be taken over
+            item = await dlq.find_one_and_update(
+                {"next_retry_at": {"$lte": now}, "lease_until": {"$not": {"$gt": now}}},
+                {"$set": {"lease_until": lease_until, "owner": self._worker_id}},
+                return_document=ReturnDocument.AFTER,
+            )
+            if item is None:
+                break
+            claimed.append(item)
+        return claimed
\ No newline at end of file
@@ -1,28 +1,82 @@
-import json
-from typing import Any, Dict, Optional, Union
+from typing import Any, Dict, Optional, Set, Union
 
+import msgpack
+import orjson
+import zstandard as zstd
 from redis.asyncio import Redis
 
 
+# Small payloads grow under compression; zstd frames self-identify by magic number
+COMPRESS_MIN_BYTES = 256
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+_compressor = zstd.ZstdCompressor(level=3)
+_decompressor = zstd.ZstdDecompressor()
+
+# Marks list items this class wrote as JSON (the RFC 7464 record separator), so a
+# range of them can be parsed in one pass; untagged items are parsed one by one
+_JSON_ITEM_TAG = b"\x1e"
+
+# One SCAN step plus UNLINK per call; keeps each script run short so Redis is never blocked long
+_CLEAR_STEP_SCRIPT = """
+local r = redis.call('SCAN', ARGV[1], 'MATCH', KEYS[1], 'COUNT', ARGV[2])
+local n = 0
+if #r[2] > 0 then n = redis.call('UNLINK', unpack(r[2])) end
+return {r[1], n}
+"""
+
+
+def _encode(value: Union[Dict[str, Any], str, bytes]) -> bytes:
+    """Serialize a cache value, compressing it when large enough to pay off."""
+    if isinstance(value, dict):
+        value = orjson.dumps(value)
+    elif isinstance(value, str):
+        value = value.encode()
+    if len(value) >= COMPRESS_MIN_BYTES:
+        return _compressor.compress(value)
+    return value
+
+
+def _decode(raw: bytes) -> bytes:
+    """Undo _encode compression; plain values written before compression pass through."""
+    if raw[:4] == _ZSTD_MAGIC:
+        return _decompressor.decompress(raw)
+    return raw
+
+
+def _decode_list_item(raw: bytes) -> Any:
+    """Parse one list item; untagged items are JSON if they parse, else plain text."""
+    if raw[:1] == _JSON_ITEM_TAG:
+        return orjson.loads(raw[1:])
+    try:
+        return orjson.loads(raw)
+    except orjson.JSONDecodeError:
+        return raw.decode()
+
+
 class Cache:
     def __init__(self, redis: Redis):
         self.redis = redis
+        self._clear_step = redis.register_script(_CLEAR_STEP_SCRIPT)
 
     async def get(self, key: str) -> Optional[Dict[str, Any]]:
         """Get a value from cache."""
+        value = await self.get_raw(key)
+        return orjson.loads(value) if value else None
+
+    async def get_raw(self, key: str) -> Optional[bytes]:
+        """Get a serialized value from cache without parsing it."""
         value = await self.redis.get(key)
-        return json.loads(value) if value else None
+        return _decode(value) if value else None
 
     async def set(
         self,
         key: str,
-        value: Union[Dict[str, Any], str],
+        value: Union[Dict[str, Any], str, bytes],
         ttl: Optional[int] = None
     ) -> bool:
         """Set a value in cache with optional TTL."""
         try:
-            if isinstance(value, dict):
-                value = json.dumps(value)
+            value = _encode(value)
             if ttl:
                 await self.redis.setex(key, ttl, value)
             else:
@@ -55,7 +109,7 @@ class Cache:
         """Remove values from a set."""
         return await self.redis.srem(key, *values)
 
-    async def set_members(self, key: str) -> set[str]:
+    async def set_members(self, key: str) -> Set[str]:
         """Get all members of a set."""
         members = await self.redis.smembers(key)
         return {m.decode() for m in members}
@@ -67,7 +121,7 @@ class Cache:
     async def hash_set(self, key: str, mapping: Dict[str, Any]) -> bool:
         """Set multiple hash fields."""
         try:
-            serialized = {k: json.dumps(v) for k, v in mapping.items()}
+            serialized = {k: msgpack.packb(v) for k, v in mapping.items()}
             await self.redis.hset(key, mapping=serialized)
             return True
         except Exception:
@@ -76,13 +130,13 @@ class Cache:
     async def hash_get(self, key: str, field: str) -> Optional[Dict[str, Any]]:
         """Get a hash field."""
         value = await self.redis.hget(key, field)
-        return json.loads(value) if value else None
+        return msgpack.unpackb(value) if value else None
 
     async def hash_get_all(self, key: str) -> Dict[str, Any]:
         """Get all hash fields."""
         result = await self.redis.hgetall(key)
         return {
-            k.decode(): json.loads(v.decode())
+            k.decode(): msgpack.unpackb(v)
             for k, v in result.items()
         }
 
@@ -94,7 +148,7 @@ class Cache:
         """Push values to a list."""
         try:
             serialized = [
-                json.dumps(v) if isinstance(v, (dict, list)) else v
+                v if isinstance(v, bytes) else _JSON_ITEM_TAG + orjson.dumps(v)
                 for v in values
             ]
             return await self.redis.rpush(key, *serialized)
@@ -104,32 +158,27 @@ class Cache:
     async def list_pop(self, key: str) -> Optional[Any]:
         """Pop a value from a list."""
         value = await self.redis.lpop(key)
-        if not value:
-            return None
-        try:
-            return json.loads(value)
-        except json.JSONDecodeError:
-            return value.decode()
+        return _decode_list_item(value) if value else None
 
     async def list_range(self, key: str, start: int = 0, end: int = -1) -> list[Any]:
         """Get a range of values from a list."""
         values = await self.redis.lrange(key, start, end)
-        result = []
-        for v in values:
-            try:
-                result.append(json.loads(v))
-            except json.JSONDecodeError:
-                result.append(v.decode())
-        return result
-
-    async def clear_pattern(self, pattern: str) -> int:
+        if not values:
+            return []
+        # Each tagged item is one complete JSON value, so joining them cannot merge or split items
+        if all(v[:1] == _JSON_ITEM_TAG for v in values):
+            return orjson.loads(b"[" + b",".join([v[1:] for v in values]) + b"]")
+        return [_decode_list_item(v) for v in values]
+
+    async def clear_pattern(self, pattern: str, count: int = 500) -> int:
         """Delete all keys matching a pattern."""
-        keys = []
-        async for key in self.redis.scan_iter(pattern):
-            keys.append(key)
-        if keys:
-            return await self.redis.delete(*keys)
-        return 0
+        deleted = 0
+        cursor = b"0"
+        while True:
+            cursor, n = await self._clear_step(keys=[pattern], args=[cursor, count])
+            deleted += n
+            if cursor in (b"0", "0"):
+                return deleted
 
     async def clear_all(self) -> bool:
         """Clear all keys in the current database."""
@@ -0,0 +1,45 @@
+import os
+
+import aioredis
+import pytest
+
+from main import (
+    FLIGHT_CACHE_PREFIX,
+    _decode_flight_cache,
+    _encode_flight_cache,
+    create_binary_redis,
+)
+
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379")
+
+
+@pytest.fixture
+async def redis_bin():
+    client = create_binary_redis(REDIS_URL)
+    try:
+        await client.ping()
+    except (aioredis.exceptions.ConnectionError, OSError) as e:
+        pytest.skip(f"Redis not reachable at {REDIS_URL}: {e}")
+    yield client
+    await client.close()
+
+
+async def test_flight_cache_entry_round_trips_through_app_client(redis_bin):
+    cache_key = f"{FLIGHT_CACHE_PREFIX}:TEST123:2024-01-01"
+    entry = {
+        "flight_number": "TEST123",
+        "status": "IN_AIR",
+        "codeshare_flights": [f"XX{i}" for i in range(100)],
+    }
+    try:
+        await redis_bin.setex(cache_key, 30, _encode_flight_cache(entry))
+        cached, fresh, known_missing = await redis_bin.mget(
+            cache_key, f"{cache_key}:fresh", f"{cache_key}:neg"
+        )
+
+        assert isinstance(cached, bytes)
+        assert _decode_flight_cache(cached) == entry
+        assert fresh is None
+        assert known_missing is None
+    finally:
+        await redis_bin.delete(cache_key)
@@ -0,0 +1,60 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import orjson
+
+from flight_info.utils.cache import COMPRESS_MIN_BYTES, Cache
+
+
+def make_cache(values=()):
+    redis = MagicMock()
+    redis.lrange = AsyncMock(return_value=list(values))
+    redis.rpush = AsyncMock(side_effect=lambda key, *items: len(items))
+    redis.set = AsyncMock()
+    return Cache(redis)
+
+
+async def pushed(cache, *values):
+    """Push values and return the raw items list_push sent to Redis."""
+    await cache.list_push("key", *values)
+    return list(cache.redis.rpush.call_args.args[1:])
+
+
+async def test_list_range_round_trips_pushed_values():
+    cache = make_cache()
+    values = [{"a": 1}, [1, 2], "1,2", 3, '"x', 'y"']
+    cache.redis.lrange.return_value = await pushed(cache, *values)
+
+    assert await cache.list_range("key") == values
+
+
+async def test_list_range_parses_untagged_items_one_by_one():
+    cache = make_cache([b"1,2", b'"x', b'y"', b"[1, 2]", b"4"])
+
+    assert await cache.list_range("key") == ["1,2", '"x', 'y"', [1, 2], 4]
+
+
+async def test_list_range_handles_tagged_and_untagged_items_together():
+    cache = make_cache()
+    tagged = await pushed(cache, {"gate": "A1"})
+    cache.redis.lrange.return_value = tagged + [b"gate A1"]
+
+    assert await cache.list_range("key") == [{"gate": "A1"}, "gate A1"]
+
+
+async def test_list_range_of_missing_key_is_empty():
+    cache = make_cache()
+
+    assert await cache.list_range("key") == []
+
+
+async def test_large_values_are_compressed_and_read_back():
+    cache = make_cache()
+    value = {"flight_number": "AA123", "codeshares": [f"XX{i}" for i in range(100)]}
+
+    assert await cache.set("key", value)
+    stored = cache.redis.set.call_args.args[1]
+    assert len(stored) < len(orjson.dumps(value))
+    assert len(orjson.dumps(value)) >= COMPRESS_MIN_BYTES
+
+    cache.redis.get = AsyncMock(return_value=stored)
+    assert await cache.get("key") == value
@@ -0,0 +1,50 @@
+import asyncio
+
+from main import DelayPredictor
+
+FLIGHT = {"flight_number": "AA123", "airline": "AA", "scheduled_departure": "2024-01-01T10:00:00"}
+
+
+async def test_model_load_failure_returns_fallback_prediction(monkeypatch):
+    predictor = DelayPredictor()
+
+    async def broken_model():
+        raise RuntimeError("model store unavailable")
+
+    monkeypatch.setattr(predictor, "initialize_model", broken_model)
+
+    prediction = await asyncio.wait_for(predictor.predict_delay(FLIGHT), timeout=1)
+
+    assert prediction.factors == ["prediction_error"]
+    assert not predictor._batcher.done()
+
+
+async def test_failed_batch_resolves_every_queued_request(monkeypatch):
+    predictor = DelayPredictor()
+
+    async def broken_batch(flights):
+        raise RuntimeError("inference crashed")
+
+    monkeypatch.setattr(predictor, "predict_delay_batch", broken_batch)
+
+    predictions = await asyncio.wait_for(
+        asyncio.gather(*(predictor.predict_delay(FLIGHT) for _ in range(5))), timeout=1
+    )
+
+    assert [p.factors for p in predictions] == [["prediction_error"]] * 5
+
+
+async def test_restarted_batcher_keeps_queued_requests():
+    predictor = DelayPredictor()
+    predictor._pending = asyncio.Queue()
+    future = asyncio.get_running_loop().create_future()
+    predictor._pending.put_nowait((FLIGHT, future))
+
+    async def broken_model():
+        raise RuntimeError("model store unavailable")
+
+    predictor.initialize_model = broken_model
+
+    await asyncio.wait_for(predictor.predict_delay(FLIGHT), timeout=1)
+
+    assert future.done()
@@ -0,0 +1,102 @@
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+import numpy as np
+
+from main import (
+    CONFIG,
+    FLIGHT_CACHE_COMPRESS_MIN_BYTES,
+    MAX_SCHEDULED_TTL_SECONDS,
+    TERMINAL_STATUS_TTL_SECONDS,
+    _ZSTD_MAGIC,
+    _decode_flight_cache,
+    _encode_flight_cache,
+    derive_ttl,
+)
+
+
+def make_entry(**overrides):
+    entry = {
+        "flight_number": "AA123",
+        "airline": "AA",
+        "origin": {
+            "code": "JFK",
+            "name": "John F Kennedy",
+            "city": "New York",
+            "timezone": "America/New_York",
+        },
+        "destination": {
+            "code": "LAX",
+            "name": "Los Angeles",
+            "city": "Los Angeles",
+            "timezone": "America/Los_Angeles",
+        },
+        "scheduled_departure": "2024-01-01T10:00:00",
+        "scheduled_arrival": "2024-01-01T13:30:00",
+        "status": "SCHEDULED",
+        "last_updated": "2024-01-01T09:00:00",
+        "last_updated_ts": 1704099600.0,
+        "data_sources": ["aggregated"],
+    }
+    entry.update(overrides)
+    return entry
+
+
+def test_small_entry_round_trips_uncompressed():
+    entry = {"flight_number": "AA1", "status": "ARRIVED"}
+    raw = _encode_flight_cache(entry)
+
+    assert len(raw) < FLIGHT_CACHE_COMPRESS_MIN_BYTES
+    assert raw[:4] != _ZSTD_MAGIC
+    assert _decode_flight_cache(raw) == entry
+
+
+def test_large_entry_is_compressed_and_round_trips():
+    entry = make_entry(codeshare_flights=[f"XX{i}" for i in range(100)])
+    raw = _encode_flight_cache(entry)
+
+    assert raw[:4] == _ZSTD_MAGIC
+    assert _decode_flight_cache(raw) == entry
+
+
+def test_numpy_scalars_and_decimals_are_stored_as_plain_numbers():
+    entry = make_entry(
+        delay_prediction={
+            "predicted_delay_minutes": np.float32(12.5),
+            "confidence": Decimal("0.75"),
+        }
+    )
+    decoded = _decode_flight_cache(_encode_flight_cache(entry))
+
+    assert decoded["delay_prediction"] == {"predicted_delay_minutes": 12.5, "confidence": 0.75}
+
+
+def in_seconds(seconds):
+    return (datetime.utcnow() + timedelta(seconds=seconds)).isoformat()
+
+
+def test_terminal_status_uses_long_ttl():
+    assert derive_ttl(make_entry(status="ARRIVED")) == TERMINAL_STATUS_TTL_SECONDS
+    assert derive_ttl(make_entry(status="CANCELLED")) == TERMINAL_STATUS_TTL_SECONDS
+
+
+def test_in_air_ttl_stays_short_until_arrival():
+    ttl = derive_ttl(make_entry(status="IN_AIR", estimated_arrival=in_seconds(6 * 3600)))
+
+    assert ttl == CONFIG["CACHE_TTL_SECONDS"]
+
+
+def test_scheduled_ttl_is_capped_and_floored():
+    far_departure = in_seconds(2 * MAX_SCHEDULED_TTL_SECONDS)
+    far = derive_ttl(make_entry(status="SCHEDULED", scheduled_departure=far_departure))
+    soon = derive_ttl(make_entry(status="SCHEDULED", scheduled_departure=in_seconds(10)))
+
+    assert far == MAX_SCHEDULED_TTL_SECONDS
+    assert soon == CONFIG["CACHE_TTL_SECONDS"]
+
+
+def test_unknown_or_unparseable_times_fall_back_to_default():
+    default = CONFIG["CACHE_TTL_SECONDS"]
+
+    assert derive_ttl(make_entry(status="BOARDING")) == default
+    assert derive_ttl(make_entry(status="DELAYED", scheduled_departure="not a time")) == default
@@ -0,0 +1,57 @@
+from main import FlightTable
+
+
+def position(lat, lon, **extra):
+    return {"latitude": lat, "longitude": lon, **extra}
+
+
+def test_insert_adds_rows_and_overwrites_existing_flights():
+    table = FlightTable(cap=4)
+    table.insert("AA1", position(40.0, -73.0))
+    table.insert("BA2", position(51.5, -0.5, altitude=35000.0))
+    table.insert("AA1", position(41.0, -74.0))
+
+    assert len(table) == 2
+    assert "AA1" in table and "BA2" in table
+    assert table.bulk_positions().tolist() == [[41.0, -74.0], [51.5, -0.5]]
+    assert table.alt[1] == 35000.0
+
+
+def test_insert_grows_past_initial_capacity():
+    table = FlightTable(cap=2)
+    for i in range(5):
+        table.insert(f"F{i}", position(float(i), float(i)))
+
+    assert len(table) == 5
+    assert table.bulk_positions()[:, 0].tolist() == [0.0, 1.0, 2.0, 3.0, 4.0]
+
+
+def test_remove_moves_last_row_into_the_gap():
+    table = FlightTable(cap=4)
+    table.insert("A", position(1.0, 1.0))
+    table.insert("B", position(2.0, 2.0))
+    table.insert("C", position(3.0, 3.0))
+
+    table.remove("A")
+    table.remove("missing")
+
+    assert len(table) == 2
+    assert "A" not in table
+    assert table.bulk_positions().tolist() == [[3.0, 3.0], [2.0, 2.0]]
+
+    # The moved flight is still addressable by id
+    table.insert("C", position(5.0, 5.0))
+    assert table.bulk_positions().tolist() == [[5.0, 5.0], [2.0, 2.0]]
+
+
+def test_count_within_counts_only_live_rows_inside_the_radius():
+    table = FlightTable(cap=8)
+    table.insert("near", position(40.0, -73.0))
+    table.insert("edge", position(40.9, -73.0))
+    table.insert("far", position(45.0, -73.0))
+    table.insert("gone", position(40.1, -73.1))
+    table.remove("gone")
+
+    assert table.count_within(40.0, -73.0, 1.0) == 2
+    assert table.count_within(40.0, -73.0, 0.5) == 1
+    assert FlightTable().count_within(40.0, -73.0, 1.0) == 0